@@ -1,5 +1,35 @@
 from .client import TornAPIClient
+from .lazy import LazyResponse, LazyObject, LazyArray
+from .scheduler import (
+    PRIORITY_INTERACTIVE,
+    PRIORITY_NORMAL,
+    PRIORITY_BULK,
+    DeadlineExceeded,
+    RequestScheduler,
+)
+from .shared_state import SharedStateBackend, MemoryBackend, SQLiteBackend, RedisBackend
+from .snapshots import MemberSnapshot, SnapshotDiff, SnapshotError, SnapshotStore, take_faction_snapshot
 
 __version__ = "0.1.0"
 
-__all__ = ["TornAPIClient", "__version__"]
+__all__ = [
+    "TornAPIClient",
+    "LazyResponse",
+    "LazyObject",
+    "LazyArray",
+    "RequestScheduler",
+    "DeadlineExceeded",
+    "PRIORITY_INTERACTIVE",
+    "PRIORITY_NORMAL",
+    "PRIORITY_BULK",
+    "SharedStateBackend",
+    "MemoryBackend",
+    "SQLiteBackend",
+    "RedisBackend",
+    "MemberSnapshot",
+    "SnapshotDiff",
+    "SnapshotStore",
+    "SnapshotError",
+    "take_faction_snapshot",
+    "__version__",
+]
@@ -1,5 +1,19 @@
+import contextlib
+import contextvars
+import hashlib
+import json
+import time
+
 import requests
 
+from .lazy import LazyResponse
+from .scheduler import PRIORITY_NORMAL, RequestScheduler
+from .shared_state import MemoryBackend, SharedStateBackend
+
+# (priority, absolute time.monotonic() deadline or None) for requests in the current context.
+_request_priority = contextvars.ContextVar("torn_api_request_priority", default=(PRIORITY_NORMAL, None))
+
+
 class TornAPIClient:
     """
     A Python client for the Torn API v2.
@@ -9,26 +23,110 @@ class TornAPIClient:
         attacks = client.get_user_attacks(selections="profile,stats")
     """
     BASE_URL = "https://api.torn.com/v2"
-
-    def __init__(self, api_key: str):
+    RATE_LIMIT = 100  # Requests allowed per key in each RATE_PERIOD.
+    RATE_PERIOD = 60.0  # Seconds.
+
+    def __init__(
+        self,
+        api_key: str,
+        shared_state: SharedStateBackend = None,
+        cache_ttl: float = 30.0,
+        lazy: bool = False,
+        priority_queue: bool = False,
+    ):
         """
         Initialize the Torn API client with your API key.
+
+        If shared_state is given (e.g. a SQLiteBackend), the rate-limit budget
+        for the key and a response cache of cache_ttl seconds are shared with
+        every other client using the same backend, including other processes.
+
+        If lazy is True, responses are returned as read-only LazyResponse
+        mappings that decode the body only as fields are accessed.
+
+        If priority_queue is True, requests wait for rate-limit tokens in a
+        RequestScheduler, ordered by the priority set with client.priority().
         """
         self.api_key = api_key
         self.session = requests.Session()
-
-    def _request(self, path: str, params: dict = None):
+        self.shared_state = shared_state
+        self.cache_ttl = cache_ttl
+        self.lazy = lazy
+        # Never store the raw key in shared state.
+        self._key_id = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        self.scheduler = None
+        if priority_queue:
+            self._limiter = shared_state if shared_state is not None else MemoryBackend()
+            self.scheduler = RequestScheduler(
+                self._acquire_token, interval=self.RATE_PERIOD / self.RATE_LIMIT
+            )
+
+    def _acquire_token(self) -> float:
+        """Take one request token for this key. Returns 0.0 or the seconds to wait."""
+        return self._limiter.acquire(self._key_id, self.RATE_LIMIT, self.RATE_PERIOD)
+
+    @contextlib.contextmanager
+    def priority(self, level: int, deadline: float = None):
+        """
+        Set the priority of requests made inside the block. Lower levels go first.
+        'deadline' is the number of seconds the whole block may spend; requests that
+        cannot be sent in time raise DeadlineExceeded. Raises RuntimeError unless
+        the client was created with priority_queue=True.
+
+        Usage:
+            with client.priority(PRIORITY_INTERACTIVE, deadline=5):
+                user = client.get_user()
+        """
+        if self.scheduler is None:
+            raise RuntimeError("client.priority() needs a client created with priority_queue=True")
+        if deadline is not None:
+            deadline += time.monotonic()
+        token = _request_priority.set((level, deadline))
+        try:
+            yield
+        finally:
+            _request_priority.reset(token)
+
+    def _cache_key(self, path: str, params: dict) -> str:
+        """Build the shared cache key for a request, scoped to this API key."""
+        query = "&".join(f"{k}={params[k]}" for k in sorted(params) if k != "key")
+        return f"{self._key_id}:{path}?{query}"
+
+    def _request(self, path: str, params: dict = None, lazy: bool = None):
         """
         Internal method to send a GET request to the Torn API.
+        'lazy' overrides the client's lazy setting for this request.
         """
         if params is None:
             params = {}
+        if lazy is None:
+            lazy = self.lazy
+        state = self.shared_state
+        if state is not None:
+            cache_key = self._cache_key(path, params)
+            cached = state.cache_get(cache_key)
+            if cached is not None:
+                return LazyResponse(cached) if lazy else json.loads(cached)
+        if self.scheduler is not None:
+            level, deadline = _request_priority.get()
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            self.scheduler.wait(level, remaining)
+        elif state is not None:
+            # Block until the shared budget for this key has a token.
+            while True:
+                wait = state.acquire(self._key_id, self.RATE_LIMIT, self.RATE_PERIOD)
+                if wait <= 0:
+                    break
+                time.sleep(wait)
         # Always include the API key in the parameters.
         params["key"] = self.api_key
         url = f"{self.BASE_URL}{path}"
         response = self.session.get(url, params=params)
         response.raise_for_status()
-        return response.json()
+        data = LazyResponse(response.content) if lazy else response.json()
+        if state is not None and self.cache_ttl > 0 and "error" not in data:
+            state.cache_set(cache_key, response.content, self.cache_ttl)
+        return data
 
     # --- User Endpoints ---
     def get_user_attacks(self, selections: str = "default"):
@@ -256,7 +354,8 @@ class TornAPIClient:
 
     def get_racing_races(self, selections: str = "default"):
         """Get races."""
-        data = self._request("/racing/races", {"selections": selections})
+        # Always decode eagerly, since the races are modified below.
+        data = self._request("/racing/races", {"selections": selections}, lazy=False)
         if data and "races" in data:
             for race in data["races"]:
                 # Ensure the race object has a 'race_id' field for consistency.
@@ -0,0 +1,130 @@
+import json
+from collections.abc import Mapping, Sequence
+
+try:
+    import simdjson
+except ImportError:  # pysimdjson is optional.
+    simdjson = None
+
+
+def _parse(raw: bytes):
+    """
+    Parse a JSON payload.
+    With pysimdjson installed, objects and arrays are only decoded into
+    Python values when they are accessed.
+    """
+    if simdjson is not None:
+        return simdjson.Parser().parse(raw)
+    return json.loads(raw)
+
+
+def _wrap(value):
+    """Wrap a lazily parsed object or array so it behaves like a Mapping or Sequence."""
+    if simdjson is not None:
+        if isinstance(value, simdjson.Object):
+            return LazyObject(value)
+        if isinstance(value, simdjson.Array):
+            return LazyArray(value)
+    return value
+
+
+def _materialise(value):
+    """Convert a value returned by a lazy view into plain dicts and lists."""
+    if isinstance(value, LazyObject):
+        return value.to_dict()
+    if isinstance(value, LazyArray):
+        return value.to_list()
+    return value
+
+
+class LazyObject(Mapping):
+    """
+    Read-only Mapping view over a JSON object.
+    Sub-trees are decoded only when they are accessed.
+    """
+
+    def __init__(self, node):
+        self._node = node
+
+    def __getitem__(self, key):
+        return _wrap(self._node[key])
+
+    def __iter__(self):
+        return iter(self._node.keys())
+
+    def __len__(self):
+        return len(self._node)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def at(self, pointer: str):
+        """
+        Return the value at a JSON pointer, e.g. client.get_faction_chain().at("/chain/current").
+        Raises KeyError or IndexError if the path does not exist.
+        """
+        node = self._node
+        if simdjson is not None and isinstance(node, simdjson.Object):
+            return _wrap(node.at_pointer(pointer))
+        for part in pointer.split("/")[1:]:
+            part = part.replace("~1", "/").replace("~0", "~")
+            node = node[int(part)] if isinstance(node, list) else node[part]
+        return node
+
+    def to_dict(self) -> dict:
+        """Decode the whole object into plain dicts and lists."""
+        node = self._node
+        if simdjson is not None and isinstance(node, simdjson.Object):
+            return node.as_dict()
+        return {k: _materialise(v) for k, v in node.items()}
+
+
+class LazyArray(Sequence):
+    """
+    Read-only Sequence view over a JSON array.
+    Elements are decoded only when they are accessed.
+    """
+
+    def __init__(self, node):
+        self._node = node
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return _wrap(self._node[index])
+
+    def __len__(self):
+        return len(self._node)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_list()!r})"
+
+    def to_list(self) -> list:
+        """Decode the whole array into plain dicts and lists."""
+        return self._node.as_list()
+
+
+class LazyResponse(LazyObject):
+    """
+    A Torn API response that keeps the raw body and decodes it on demand.
+
+    Returned by TornAPIClient when created with lazy=True. It is a read-only
+    Mapping, so existing code that reads responses keeps working. Nested
+    objects are LazyObject views and arrays are LazyArray views; call
+    to_dict() to get plain Python values.
+    """
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self._parsed = None
+
+    @property
+    def _node(self):
+        if self._parsed is None:
+            self._parsed = _parse(self.raw)
+        return self._parsed
@@ -0,0 +1,120 @@
+import itertools
+import threading
+import time
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 10
+PRIORITY_BULK = 20
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request cannot be sent before its deadline."""
+
+
+class _Ticket:
+    __slots__ = ("priority", "deadline", "enqueued", "seq")
+
+    def __init__(self, priority: int, deadline, enqueued: float, seq: int):
+        self.priority = priority
+        self.deadline = deadline
+        self.enqueued = enqueued
+        self.seq = seq
+
+
+class RequestScheduler:
+    """
+    Hands out rate-limit tokens to waiting requests in priority order.
+
+    Lower priority values go first (see PRIORITY_INTERACTIVE, PRIORITY_NORMAL
+    and PRIORITY_BULK). To stop bulk work from starving, a waiting request
+    moves up one priority level for every 'aging' seconds it has waited.
+
+    Requests with a deadline fail with DeadlineExceeded, without using up a
+    token, as soon as they are expected to miss it. This is checked when a
+    request is queued and every time the queue changes. While the key is
+    saturated, a request is expected to be sent when the next token arrives
+    plus 'interval' seconds for each request ahead of it. That assumes tokens
+    then arrive evenly, so a request can be failed even though a burst of
+    freed tokens would have served it in time. While tokens are available, no
+    estimate is made and only the deadline itself is enforced.
+
+    'acquire_token' is called with no arguments. It must take one token and
+    return 0.0, or return the number of seconds until one is available. It is
+    called without holding the scheduler's lock, so a slow backend does not
+    stop other threads from queueing or timing out.
+    """
+
+    def __init__(self, acquire_token, interval: float = 0.0, aging: float = 6.0):
+        self.acquire_token = acquire_token
+        self.interval = interval
+        self.aging = aging
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._seq = itertools.count()
+        self._acquiring = False
+        # time.monotonic() at which the next token is expected, while the key is saturated.
+        self._next_token = 0.0
+
+    def _sort_key(self, ticket: _Ticket, now: float):
+        return (ticket.priority - (now - ticket.enqueued) / self.aging, ticket.seq)
+
+    def _ahead(self, ticket: _Ticket, now: float) -> int:
+        """Return the number of waiting requests that will be served before 'ticket'."""
+        key = self._sort_key(ticket, now)
+        return sum(1 for other in self._waiting if self._sort_key(other, now) < key)
+
+    def pending(self) -> int:
+        """Return the number of requests waiting for a token."""
+        with self._cond:
+            return len(self._waiting)
+
+    def wait(self, priority: int = PRIORITY_NORMAL, deadline: float = None):
+        """
+        Block until this request may be sent.
+        'deadline' is in seconds from now; DeadlineExceeded is raised once it is expected to be missed.
+        """
+        now = time.monotonic()
+        if deadline is not None:
+            deadline += now
+        ticket = _Ticket(priority, deadline, now, next(self._seq))
+        with self._cond:
+            self._waiting.append(ticket)
+            # A more urgent request may need to take over from the current head.
+            self._cond.notify_all()
+            try:
+                while True:
+                    now = time.monotonic()
+                    remaining = deadline - now if deadline is not None else None
+                    if remaining is not None and remaining <= 0:
+                        raise DeadlineExceeded("request deadline passed while queued")
+                    ahead = self._ahead(ticket, now)
+                    if remaining is not None and self._next_token > now:
+                        expected = self._next_token + ahead * self.interval - now
+                        if expected > remaining:
+                            raise DeadlineExceeded(
+                                f"expected to be sent in {expected:.2f}s with {ahead} requests ahead, "
+                                f"deadline in {remaining:.2f}s"
+                            )
+                    if ahead or self._acquiring:
+                        self._cond.wait(remaining)
+                        continue
+                    self._acquiring = True
+                    self._cond.release()
+                    try:
+                        delay = self.acquire_token()
+                    finally:
+                        self._cond.acquire()
+                        self._acquiring = False
+                        self._cond.notify_all()
+                    now = time.monotonic()
+                    self._next_token = now + max(delay, 0.0)
+                    if delay <= 0:
+                        return
+                    if deadline is not None and delay > deadline - now:
+                        raise DeadlineExceeded(
+                            f"next token in {delay:.2f}s, deadline in {deadline - now:.2f}s"
+                        )
+                    self._cond.wait(delay)
+            finally:
+                self._waiting.remove(ticket)
+                self._cond.notify_all()
@@ -0,0 +1,235 @@
+import collections
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+try:
+    from redis.exceptions import WatchError
+except ImportError:  # redis is optional.
+    class WatchError(Exception):
+        """Stand-in for redis.exceptions.WatchError when redis is not installed."""
+
+
+def window_wait(grants: list, now: float, limit: int, period: float) -> float:
+    """
+    Sliding-window log check shared by all backends.
+
+    'grants' holds the times of the requests granted in the last 'period'
+    seconds, oldest first. Returns 0.0 if one more request keeps the count
+    at or below 'limit' in every 'period'-long span, otherwise the number of
+    seconds until enough old grants have left the window.
+    """
+    if len(grants) < limit:
+        return 0.0
+    return max(grants[-limit] + period - now, 1e-3)
+
+
+class SharedStateBackend:
+    """
+    Base class for state shared between TornAPIClient instances.
+
+    A backend holds the per-key rate-limit windows and the response cache so
+    that several worker processes using the same API key can coordinate.
+    """
+
+    def acquire(self, bucket: str, limit: int, period: float) -> float:
+        """
+        Try to take one request token from 'bucket'. At most 'limit' tokens
+        are granted in any span of 'period' seconds.
+
+        Returns 0.0 if a token was taken, otherwise the number of seconds to
+        wait before trying again.
+        """
+        raise NotImplementedError
+
+    def cache_get(self, key: str):
+        """Return the cached bytes for 'key', or None if missing or expired."""
+        raise NotImplementedError
+
+    def cache_set(self, key: str, value: bytes, ttl: float):
+        """Store 'value' under 'key' for 'ttl' seconds."""
+        raise NotImplementedError
+
+
+class MemoryBackend(SharedStateBackend):
+    """
+    State kept in the current process only.
+
+    TornAPIClient uses it to rate-limit the priority queue when no shared
+    backend is given. Pass one explicitly to share a cache between clients
+    in the same process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._grants = {}
+        self._cache = {}
+
+    def acquire(self, bucket: str, limit: int, period: float) -> float:
+        """Sliding-window log of grant times, as in SQLiteBackend."""
+        with self._lock:
+            now = time.time()
+            grants = self._grants.setdefault(bucket, collections.deque())
+            while grants and grants[0] <= now - period:
+                grants.popleft()
+            wait = window_wait(grants, now, limit, period)
+            if wait == 0:
+                grants.append(now)
+        return wait
+
+    def cache_get(self, key: str):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or entry[1] <= time.time():
+                return None
+            return entry[0]
+
+    def cache_set(self, key: str, value: bytes, ttl: float):
+        now = time.time()
+        with self._lock:
+            for name in [name for name, entry in self._cache.items() if entry[1] <= now]:
+                del self._cache[name]
+            self._cache[key] = (value, now + ttl)
+
+
+class SQLiteBackend(SharedStateBackend):
+    """
+    Shared state stored in a local SQLite file.
+
+    Every process on the host that opens the same path sees the same request
+    windows and cache. Updates run inside 'BEGIN IMMEDIATE' transactions, so
+    SQLite's file lock serialises them across processes.
+
+    Usage:
+        state = SQLiteBackend("/tmp/torn_api_state.db")
+        client = TornAPIClient(api_key="YOUR_API_KEY", shared_state=state)
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        """
+        Open (or create) the state database at 'path'.
+        'timeout' is how long to wait for another process to release the lock.
+        """
+        self.path = path
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        with self._lock:
+            conn = self._connection()
+            conn.execute("CREATE TABLE IF NOT EXISTS grants (name TEXT NOT NULL, granted REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS grants_name ON grants (name, granted)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(name TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)")
+
+    def _connection(self):
+        """
+        Return a connection owned by the current process.
+        SQLite connections must not be shared across a fork, so reopen if the pid changed.
+        """
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._pid = os.getpid()
+        return self._conn
+
+    def acquire(self, bucket: str, limit: int, period: float) -> float:
+        """Sliding-window log of grant times, one row per granted request."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                conn.execute("DELETE FROM grants WHERE name = ? AND granted <= ?", (bucket, now - period))
+                grants = [
+                    row[0] for row in conn.execute(
+                        "SELECT granted FROM grants WHERE name = ? ORDER BY granted", (bucket,)
+                    )
+                ]
+                wait = window_wait(grants, now, limit, period)
+                if wait == 0:
+                    conn.execute("INSERT INTO grants (name, granted) VALUES (?, ?)", (bucket, now))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def cache_get(self, key: str):
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value FROM cache WHERE name = ? AND expires > ?", (key, time.time())
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def cache_set(self, key: str, value: bytes, ttl: float):
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM cache WHERE expires <= ?", (now,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (name, value, expires) VALUES (?, ?, ?)",
+                    (key, value, now + ttl),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+
+class RedisBackend(SharedStateBackend):
+    """
+    Shared state stored in Redis, for workers spread over several hosts.
+
+    'client' is any Redis-compatible object providing get, set (with 'px')
+    and pipeline() with WATCH/MULTI transactions, such as redis.Redis. The
+    redis package is not a dependency of torn_api; install it yourself if you
+    use this backend.
+
+    Each rate-limit window is a sorted set of grant times, updated in a
+    WATCH/MULTI transaction that is retried if another worker changed it.
+    Grant times come from each worker's clock, so keep the hosts in sync.
+    """
+
+    def __init__(self, client, prefix: str = "torn_api:"):
+        """
+        Wrap a Redis-compatible 'client'. All keys are stored under 'prefix'.
+        """
+        self.client = client
+        self.prefix = prefix
+
+    def acquire(self, bucket: str, limit: int, period: float) -> float:
+        name = f"{self.prefix}rl:{bucket}"
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(name)
+                    now = time.time()
+                    grants = [
+                        score for _, score in pipe.zrangebyscore(name, f"({now - period}", "+inf", withscores=True)
+                    ]
+                    wait = window_wait(grants, now, limit, period)
+                    pipe.multi()
+                    pipe.zremrangebyscore(name, "-inf", now - period)
+                    if wait == 0:
+                        pipe.zadd(name, {f"{now}:{uuid.uuid4().hex}": now})
+                        pipe.pexpire(name, int(period * 1000) + 1000)
+                    pipe.execute()
+                    return wait
+                except WatchError:
+                    continue
+
+    def cache_get(self, key: str):
+        return self.client.get(f"{self.prefix}cache:{key}")
+
+    def cache_set(self, key: str, value: bytes, ttl: float):
+        self.client.set(f"{self.prefix}cache:{key}", value, px=max(1, int(ttl * 1000)))
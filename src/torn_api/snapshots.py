@@ -0,0 +1,272 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections.abc import Mapping
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional.
+    np = None
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot cannot be taken because the Torn API returned an error."""
+
+
+def _check_response(data, what: str):
+    """Raise SnapshotError for Torn's {"error": {"code": ..., "error": ...}} responses, which arrive as HTTP 200."""
+    if "error" in data:
+        error = data["error"]
+        raise SnapshotError(f"{what} failed: Torn API error {error.get('code')}: {error.get('error')}")
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for snapshots; install torn-api with the 'snapshots' extra")
+
+
+def _flatten(data, prefix: str = "", out: dict = None) -> dict:
+    """
+    Flatten nested numeric fields into dotted column names, e.g.
+    {"attacking": {"attacks": {"won": 5}}} -> {"attacking.attacks.won": 5}.
+    Non-numeric fields are dropped.
+    """
+    if out is None:
+        out = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, Mapping):
+            _flatten(value, f"{name}.", out)
+        elif isinstance(value, (int, float)):
+            out[name] = value
+    return out
+
+
+class MemberSnapshot:
+    """
+    Numeric stats for a set of faction members at one point in time.
+
+    'ids' is a sorted int64 array of member IDs and 'values' is a float64
+    array with one row per member and one column per name in 'columns'.
+    Stats a member did not report are NaN.
+    """
+
+    def __init__(self, ids, columns: list, values, timestamp: float):
+        _require_numpy()
+        self.ids = ids
+        self.columns = list(columns)
+        self.values = values
+        self.timestamp = timestamp
+        self._column_index = {name: i for i, name in enumerate(self.columns)}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __repr__(self):
+        return f"MemberSnapshot({len(self.ids)} members, {len(self.columns)} columns, timestamp={self.timestamp})"
+
+    @classmethod
+    def from_records(cls, records: Mapping, timestamp: float = None):
+        """
+        Build a snapshot from {member_id: stats}. Nested stats are flattened
+        into dotted column names and non-numeric fields are ignored.
+        """
+        _require_numpy()
+        flat = {int(member_id): _flatten(stats) for member_id, stats in records.items()}
+        ids = np.array(sorted(flat), dtype=np.int64)
+        columns = sorted({name for stats in flat.values() for name in stats})
+        column_index = {name: i for i, name in enumerate(columns)}
+        values = np.full((len(ids), len(columns)), np.nan)
+        for row, member_id in enumerate(ids.tolist()):
+            for name, value in flat[member_id].items():
+                values[row, column_index[name]] = value
+        return cls(ids, columns, values, time.time() if timestamp is None else timestamp)
+
+    def column(self, name: str):
+        """Return the values of one column, in the order of 'ids'."""
+        return self.values[:, self._column_index[name]]
+
+    def save(self, path: str):
+        """
+        Write the snapshot to the directory 'path', which must not exist yet.
+        The arrays are stored as .npy files so load() can memory-map them.
+
+        The files are written to a hidden temporary directory next to 'path'
+        and then renamed into place, so a crash never leaves a partial
+        snapshot at 'path'. Raises FileExistsError instead of overwriting.
+        """
+        path = os.path.abspath(path)
+        if os.path.exists(path):
+            raise FileExistsError(f"snapshot already exists: {path}")
+        parent = os.path.dirname(path)
+        os.makedirs(parent, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=f".{os.path.basename(path)}.", dir=parent)
+        try:
+            np.save(os.path.join(tmp, "ids.npy"), self.ids)
+            np.save(os.path.join(tmp, "values.npy"), self.values)
+            with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({"timestamp": self.timestamp, "columns": self.columns}, f)
+            if os.path.exists(path):
+                raise FileExistsError(f"snapshot already exists: {path}")
+            os.replace(tmp, path)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        """Load a snapshot written by save(). With mmap, the arrays are memory-mapped read-only."""
+        _require_numpy()
+        mode = "r" if mmap else None
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        ids = np.load(os.path.join(path, "ids.npy"), mmap_mode=mode)
+        values = np.load(os.path.join(path, "values.npy"), mmap_mode=mode)
+        return cls(ids, meta["columns"], values, meta["timestamp"])
+
+    def diff(self, newer: "MemberSnapshot") -> "SnapshotDiff":
+        """Compare this snapshot with a later one. See SnapshotDiff."""
+        return SnapshotDiff(self, newer)
+
+
+class SnapshotDiff:
+    """
+    Per-member changes between two snapshots.
+
+    Only members and columns present in both snapshots are compared.
+    'joined' and 'left' hold the IDs of members found in only the newer or
+    only the older snapshot.
+    """
+
+    def __init__(self, old: MemberSnapshot, new: MemberSnapshot):
+        self.old = old
+        self.new = new
+        self.ids, old_rows, new_rows = np.intersect1d(
+            old.ids, new.ids, assume_unique=True, return_indices=True
+        )
+        self.columns = [name for name in new.columns if name in old._column_index]
+        old_cols = [old._column_index[name] for name in self.columns]
+        new_cols = [new._column_index[name] for name in self.columns]
+        self.deltas = new.values[np.ix_(new_rows, new_cols)] - old.values[np.ix_(old_rows, old_cols)]
+        self.elapsed = new.timestamp - old.timestamp
+        self.joined = np.setdiff1d(new.ids, old.ids, assume_unique=True)
+        self.left = np.setdiff1d(old.ids, new.ids, assume_unique=True)
+        self._column_index = {name: i for i, name in enumerate(self.columns)}
+
+    def delta(self, column: str):
+        """Return the change in 'column' for each member in 'ids'."""
+        return self.deltas[:, self._column_index[column]]
+
+    def rates(self, per: float = 3600.0):
+        """Return all deltas as rates per 'per' seconds (per hour by default)."""
+        if self.elapsed <= 0:
+            raise ValueError("snapshots must be in chronological order to compute rates")
+        return self.deltas * (per / self.elapsed)
+
+    def rate(self, column: str, per: float = 3600.0):
+        """Return the rate of change of 'column' per 'per' seconds for each member."""
+        if self.elapsed <= 0:
+            raise ValueError("snapshots must be in chronological order to compute rates")
+        return self.delta(column) * (per / self.elapsed)
+
+    def leaderboard(self, column: str, top: int = 10, ascending: bool = False) -> list:
+        """
+        Return [(member_id, delta), ...] for the members with the largest
+        change in 'column' (smallest if ascending). Members with no value are skipped.
+        """
+        values = self.delta(column)
+        valid = np.flatnonzero(~np.isnan(values))
+        keys = values[valid] if ascending else -values[valid]
+        top = min(top, len(valid))
+        if top == 0:
+            return []
+        best = np.argpartition(keys, top - 1)[:top]
+        best = best[np.argsort(keys[best], kind="stable")]
+        rows = valid[best]
+        return list(zip(self.ids[rows].tolist(), values[rows].tolist()))
+
+
+class SnapshotStore:
+    """
+    Snapshots saved on disk under 'root', one directory per faction and timestamp.
+
+    Usage:
+        store = SnapshotStore("snapshots")
+        store.save(faction_id, take_faction_snapshot(client, faction_id))
+        week_ago = store.nearest(faction_id, time.time() - 7 * 86400)
+        diff = week_ago.diff(store.latest(faction_id))
+        print(diff.leaderboard("personalstats.attacking.attacks.won"))
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _faction_dir(self, faction_id) -> str:
+        return os.path.join(self.root, str(faction_id))
+
+    def save(self, faction_id, snapshot: MemberSnapshot) -> str:
+        """
+        Save a snapshot and return the directory it was written to.
+        Snapshots are named by whole seconds, so saving two taken in the same
+        second raises FileExistsError rather than overwriting the first.
+        """
+        path = os.path.join(self._faction_dir(faction_id), str(int(snapshot.timestamp)))
+        snapshot.save(path)
+        return path
+
+    def timestamps(self, faction_id) -> list:
+        """Return the timestamps of the stored snapshots for a faction, oldest first."""
+        path = self._faction_dir(faction_id)
+        if not os.path.isdir(path):
+            return []
+        return sorted(int(name) for name in os.listdir(path) if name.isdigit())
+
+    def load(self, faction_id, timestamp: int, mmap: bool = True) -> MemberSnapshot:
+        """Load the snapshot taken at 'timestamp'."""
+        return MemberSnapshot.load(os.path.join(self._faction_dir(faction_id), str(timestamp)), mmap=mmap)
+
+    def latest(self, faction_id, mmap: bool = True) -> MemberSnapshot:
+        """Load the most recent snapshot for a faction."""
+        timestamps = self.timestamps(faction_id)
+        if not timestamps:
+            raise FileNotFoundError(f"no snapshots stored for faction {faction_id}")
+        return self.load(faction_id, timestamps[-1], mmap=mmap)
+
+    def nearest(self, faction_id, timestamp: float, mmap: bool = True) -> MemberSnapshot:
+        """Load the snapshot taken closest to 'timestamp', e.g. one week ago."""
+        timestamps = self.timestamps(faction_id)
+        if not timestamps:
+            raise FileNotFoundError(f"no snapshots stored for faction {faction_id}")
+        best = min(timestamps, key=lambda t: abs(t - timestamp))
+        return self.load(faction_id, best, mmap=mmap)
+
+
+def take_faction_snapshot(client, faction_id: int = None, personalstats: bool = True) -> MemberSnapshot:
+    """
+    Fetch the members of a faction with get_faction_members and, if
+    personalstats is True, each member's stats with get_user_personalstats_by_id.
+    Returns one MemberSnapshot holding all of their numeric fields.
+
+    Raises SnapshotError if any of these requests returns a Torn API error,
+    such as a rate limit, so that a partial snapshot is never stored.
+    """
+    data = client.get_faction_members(faction_id=faction_id)
+    _check_response(data, "get_faction_members")
+    if "members" not in data:
+        raise SnapshotError("get_faction_members returned no members list")
+    members = data["members"]
+    # v2 returns a list of members; older responses are keyed by member ID.
+    if isinstance(members, Mapping):
+        members = [dict(member, id=member_id) for member_id, member in members.items()]
+    records = {}
+    for member in members:
+        member_id = int(member["id"])
+        record = {"member": member}
+        if personalstats:
+            stats = client.get_user_personalstats_by_id(member_id)
+            _check_response(stats, f"get_user_personalstats_by_id({member_id})")
+            record["personalstats"] = stats.get("personalstats", stats)
+        records[member_id] = record
+    return MemberSnapshot.from_records(records)
@@ -0,0 +1,81 @@
+import json
+import unittest
+from collections.abc import Mapping, Sequence
+from unittest import mock
+
+from torn_api import TornAPIClient, LazyResponse
+from torn_api import lazy
+
+PAYLOAD = {
+    "chain": {"id": 1, "current": 12, "max": 25000},
+    "members": [
+        {"id": 10, "name": "alice", "status": {"state": "Okay"}},
+        {"id": 11, "name": "bob", "status": {"state": "Hospital"}},
+    ],
+}
+RAW = json.dumps(PAYLOAD).encode()
+
+
+class LazyResponseTests:
+    def test_mapping_access(self):
+        response = LazyResponse(RAW)
+        self.assertIsInstance(response, Mapping)
+        self.assertEqual(response["chain"]["current"], 12)
+        self.assertEqual(response.get("missing", "x"), "x")
+        self.assertEqual(sorted(response), ["chain", "members"])
+        self.assertIn("chain", response)
+
+    def test_nested_array(self):
+        members = LazyResponse(RAW)["members"]
+        self.assertIsInstance(members, Sequence)
+        self.assertEqual(len(members), 2)
+        self.assertEqual(members[-1]["status"]["state"], "Hospital")
+        self.assertEqual([m["name"] for m in members], ["alice", "bob"])
+
+    def test_pointer(self):
+        response = LazyResponse(RAW)
+        self.assertEqual(response.at("/chain/current"), 12)
+        self.assertEqual(response.at("/members/1/name"), "bob")
+        with self.assertRaises(KeyError):
+            response.at("/chain/missing")
+
+    def test_equals_and_to_dict(self):
+        response = LazyResponse(RAW)
+        self.assertEqual(response, PAYLOAD)
+        self.assertEqual(response.to_dict(), PAYLOAD)
+        self.assertIs(type(response.to_dict()["members"]), list)
+
+
+@unittest.skipIf(lazy.simdjson is None, "pysimdjson not installed")
+class TestLazyResponseSimdjson(LazyResponseTests, unittest.TestCase):
+    pass
+
+
+class TestLazyResponseFallback(LazyResponseTests, unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(lazy, "simdjson", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestClientLazy(unittest.TestCase):
+    def test_lazy_client_returns_lazy_response(self):
+        client = TornAPIClient(api_key="abc", lazy=True)
+        response = mock.Mock(content=RAW)
+        with mock.patch.object(client.session, "get", return_value=response):
+            data = client.get_faction_chain()
+        self.assertIsInstance(data, LazyResponse)
+        self.assertEqual(data["chain"]["current"], 12)
+        response.json.assert_not_called()
+
+    def test_racing_races_stays_eager(self):
+        client = TornAPIClient(api_key="abc", lazy=True)
+        body = {"races": [{"id": 5}]}
+        response = mock.Mock(content=json.dumps(body).encode(), json=mock.Mock(return_value=body))
+        with mock.patch.object(client.session, "get", return_value=response):
+            data = client.get_racing_races()
+        self.assertEqual(data["races"][0]["race_id"], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from torn_api import (
+    TornAPIClient,
+    RequestScheduler,
+    DeadlineExceeded,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_BULK,
+)
+from torn_api import shared_state
+
+
+class ManualTokens:
+    """Token source that only hands out tokens released by the test."""
+
+    def __init__(self):
+        self.available = 0
+        self.lock = threading.Lock()
+
+    def release(self, count=1):
+        with self.lock:
+            self.available += count
+
+    def __call__(self):
+        with self.lock:
+            if self.available:
+                self.available -= 1
+                return 0.0
+            return 0.01
+
+
+class TestRequestScheduler(unittest.TestCase):
+    def _start(self, scheduler, order, name, priority):
+        thread = threading.Thread(target=lambda: (scheduler.wait(priority), order.append(name)))
+        thread.start()
+        return thread
+
+    def _wait_pending(self, scheduler, count):
+        while scheduler.pending() < count:
+            time.sleep(0.001)
+
+    def test_interactive_before_bulk(self):
+        tokens = ManualTokens()
+        scheduler = RequestScheduler(tokens, aging=1000)
+        order = []
+        threads = [self._start(scheduler, order, f"bulk{i}", PRIORITY_BULK) for i in range(3)]
+        self._wait_pending(scheduler, 3)
+        threads.append(self._start(scheduler, order, "user", PRIORITY_INTERACTIVE))
+        self._wait_pending(scheduler, 4)
+        tokens.release(4)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(order[0], "user")
+        self.assertEqual(order[1:], ["bulk0", "bulk1", "bulk2"])
+
+    def test_aging_prevents_starvation(self):
+        tokens = ManualTokens()
+        scheduler = RequestScheduler(tokens, aging=0.01)
+        order = []
+        threads = [self._start(scheduler, order, "bulk", PRIORITY_BULK)]
+        self._wait_pending(scheduler, 1)
+        time.sleep(0.3)
+        threads.append(self._start(scheduler, order, "user", PRIORITY_INTERACTIVE))
+        self._wait_pending(scheduler, 2)
+        tokens.release(2)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(order, ["bulk", "user"])
+
+    def test_deadline_fails_fast(self):
+        scheduler = RequestScheduler(lambda: 30.0)
+        start = time.monotonic()
+        with self.assertRaises(DeadlineExceeded):
+            scheduler.wait(PRIORITY_INTERACTIVE, deadline=5)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(scheduler.pending(), 0)
+
+    def test_deadline_while_queued(self):
+        tokens = ManualTokens()
+        scheduler = RequestScheduler(tokens)
+        with self.assertRaises(DeadlineExceeded):
+            scheduler.wait(PRIORITY_INTERACTIVE, deadline=0.05)
+
+    def test_queued_request_fails_fast_behind_higher_priority(self):
+        saturated = threading.Event()
+        released = threading.Event()
+
+        def tokens():
+            saturated.set()
+            return 0.0 if released.is_set() else 1.0
+
+        scheduler = RequestScheduler(tokens, interval=0.6)
+        head = threading.Thread(target=scheduler.wait, args=(PRIORITY_INTERACTIVE,))
+        head.start()
+        saturated.wait()
+        start = time.monotonic()
+        with self.assertRaises(DeadlineExceeded):
+            # Next token in ~1s, plus 0.6s for the request ahead, misses a 1.2s deadline.
+            scheduler.wait(PRIORITY_BULK, deadline=1.2)
+        self.assertLess(time.monotonic() - start, 0.5)
+        released.set()
+        head.join()
+
+    def test_slow_token_source_does_not_block_queue(self):
+        entered = threading.Event()
+        release = threading.Event()
+
+        def tokens():
+            entered.set()
+            release.wait()
+            return 0.0
+
+        scheduler = RequestScheduler(tokens)
+        first = threading.Thread(target=scheduler.wait)
+        first.start()
+        entered.wait()
+        start = time.monotonic()
+        self.assertEqual(scheduler.pending(), 1)
+        with self.assertRaises(DeadlineExceeded):
+            scheduler.wait(PRIORITY_INTERACTIVE, deadline=0.05)
+        self.assertLess(time.monotonic() - start, 0.5)
+        release.set()
+        first.join()
+        self.assertEqual(scheduler.pending(), 0)
+
+
+class TestClientPriority(unittest.TestCase):
+    def test_priority_context(self):
+        client = TornAPIClient(api_key="abc", priority_queue=True)
+        response = mock.Mock(json=mock.Mock(return_value={}))
+        with mock.patch.object(client.scheduler, "wait") as wait, \
+                mock.patch.object(client.session, "get", return_value=response):
+            client.get_user()
+            with client.priority(PRIORITY_INTERACTIVE, deadline=5):
+                client.get_user()
+        self.assertEqual(wait.call_args_list[0].args, (10, None))
+        level, remaining = wait.call_args_list[1].args
+        self.assertEqual(level, PRIORITY_INTERACTIVE)
+        self.assertTrue(0 < remaining <= 5)
+
+    def test_priority_needs_priority_queue(self):
+        client = TornAPIClient(api_key="abc")
+        with self.assertRaises(RuntimeError):
+            with client.priority(PRIORITY_INTERACTIVE, deadline=5):
+                pass
+
+    def test_local_limiter_keeps_budget(self):
+        client = TornAPIClient(api_key="abc", priority_queue=True)
+        clock = [1000.0]
+        granted = 0
+        with mock.patch.object(shared_state.time, "time", side_effect=lambda: clock[0]):
+            while clock[0] < 1059.9:
+                granted += client._acquire_token() == 0
+                clock[0] += 0.1
+        self.assertEqual(granted, TornAPIClient.RATE_LIMIT)
+
+
+if __name__ == '__main__':
+    unittest.main()
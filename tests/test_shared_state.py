@@ -0,0 +1,206 @@
+import bisect
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from torn_api import TornAPIClient, SQLiteBackend, RedisBackend
+from torn_api import shared_state
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the subset of redis.Redis used by RedisBackend."""
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.versions = {}
+        # Number of upcoming transactions to abort, as if another worker wrote first.
+        self.conflicts = 0
+
+    def _expire(self, name):
+        if name in self.expires and self.expires[name] <= time.time():
+            self.data.pop(name, None)
+            self.expires.pop(name, None)
+
+    def _touch(self, name):
+        self.versions[name] = self.versions.get(name, 0) + 1
+
+    def get(self, name):
+        self._expire(name)
+        return self.data.get(name)
+
+    def set(self, name, value, px=None):
+        self.data[name] = value
+        self._touch(name)
+        if px is not None:
+            self.expires[name] = time.time() + px / 1000
+
+    def pexpire(self, name, ms):
+        self.expires[name] = time.time() + ms / 1000
+
+    def zrangebyscore(self, name, low, high, withscores=False):
+        self._expire(name)
+        members = self.data.get(name, {})
+
+        def above(score):
+            low_s = str(low)
+            return score > float(low_s[1:]) if low_s.startswith("(") else score >= float(low_s)
+
+        items = sorted((score, member) for member, score in members.items()
+                       if above(score) and score <= float(high))
+        return [(member, score) for score, member in items] if withscores else [m for _, m in items]
+
+    def zremrangebyscore(self, name, low, high):
+        members = self.data.get(name, {})
+        for member in [m for m, score in members.items() if float(low) <= score <= float(high)]:
+            del members[member]
+        self._touch(name)
+
+    def zadd(self, name, mapping):
+        self.data.setdefault(name, {}).update(mapping)
+        self._touch(name)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """WATCH/MULTI/EXEC pipeline for FakeRedis."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.watched = {}
+        self.queued = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def watch(self, name):
+        self.watched = {name: self.redis.versions.get(name, 0)}
+        self.queued = None
+
+    def multi(self):
+        self.queued = []
+
+    def __getattr__(self, command):
+        method = getattr(self.redis, command)
+        if self.queued is None:
+            return method
+        return lambda *args, **kwargs: self.queued.append((method, args, kwargs))
+
+    def execute(self):
+        if self.redis.conflicts:
+            self.redis.conflicts -= 1
+            self.redis._touch(next(iter(self.watched)))
+        changed = any(self.redis.versions.get(n, 0) != v for n, v in self.watched.items())
+        queued, self.queued, self.watched = self.queued, None, {}
+        if changed:
+            raise shared_state.WatchError()
+        return [method(*args, **kwargs) for method, args, kwargs in queued]
+
+
+class RollingWindowMixin:
+    """Checks that no span of 'period' seconds ever sees more than 'limit' grants."""
+
+    def assert_within_budget(self, state, limit=100, period=60.0, duration=300.0, step=0.1):
+        clock = [1000.0]
+        grants = []
+        with mock.patch.object(shared_state.time, "time", side_effect=lambda: clock[0]):
+            while clock[0] < 1000.0 + duration:
+                if state.acquire("key", limit, period) == 0:
+                    grants.append(clock[0])
+                clock[0] += step
+        busiest = max(bisect.bisect_left(grants, t + period) - i for i, t in enumerate(grants))
+        self.assertEqual(busiest, limit)
+        # The whole budget is still used, not just a fraction of it.
+        self.assertGreaterEqual(len(grants), limit * int(duration // period))
+
+
+def _take_tokens(path, attempts, results):
+    state = SQLiteBackend(path)
+    results.put(sum(1 for _ in range(attempts) if state.acquire("key", 10, 3600) == 0))
+
+
+class TestSQLiteBackend(RollingWindowMixin, unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "state.db")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_bucket_limits_requests(self):
+        state = SQLiteBackend(self.path)
+        granted = [state.acquire("key", 3, 60) for _ in range(4)]
+        self.assertEqual(granted[:3], [0.0, 0.0, 0.0])
+        self.assertGreater(granted[3], 0)
+
+    def test_rolling_window_budget(self):
+        self.assert_within_budget(SQLiteBackend(self.path))
+
+    def test_bucket_shared_across_processes(self):
+        SQLiteBackend(self.path)
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=_take_tokens, args=(self.path, 10, results)) for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(sum(results.get() for _ in workers), 10)
+
+    def test_cache_expires(self):
+        state = SQLiteBackend(self.path)
+        state.cache_set("a", b"1", ttl=60)
+        state.cache_set("b", b"2", ttl=-1)
+        self.assertEqual(state.cache_get("a"), b"1")
+        self.assertIsNone(state.cache_get("b"))
+
+
+class TestRedisBackend(RollingWindowMixin, unittest.TestCase):
+    def test_bucket_limits_requests(self):
+        state = RedisBackend(FakeRedis())
+        granted = [state.acquire("key", 3, 60) for _ in range(4)]
+        self.assertEqual(granted[:3], [0.0, 0.0, 0.0])
+        self.assertGreater(granted[3], 0)
+
+    def test_rolling_window_budget(self):
+        self.assert_within_budget(RedisBackend(FakeRedis()))
+
+    def test_retries_on_conflict(self):
+        redis = FakeRedis()
+        redis.conflicts = 2
+        state = RedisBackend(redis)
+        self.assertEqual(state.acquire("key", 3, 60), 0.0)
+        self.assertEqual(len(redis.data["torn_api:rl:key"]), 1)
+
+    def test_cache_round_trip(self):
+        state = RedisBackend(FakeRedis())
+        state.cache_set("a", b"1", ttl=60)
+        self.assertEqual(state.cache_get("a"), b"1")
+        self.assertIsNone(state.cache_get("missing"))
+
+
+class TestClientSharedState(unittest.TestCase):
+    def test_clients_share_cache(self):
+        state = RedisBackend(FakeRedis())
+        body = {"chain": {"current": 12}}
+        response = mock.Mock(content=json.dumps(body).encode(), json=mock.Mock(return_value=body))
+        first = TornAPIClient(api_key="abc", shared_state=state)
+        second = TornAPIClient(api_key="abc", shared_state=state)
+        with mock.patch.object(first.session, "get", return_value=response) as first_get, \
+                mock.patch.object(second.session, "get") as second_get:
+            self.assertEqual(first.get_faction_chain(), body)
+            self.assertEqual(second.get_faction_chain(), body)
+        first_get.assert_called_once()
+        second_get.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
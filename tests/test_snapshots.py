@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from torn_api import snapshots
+from torn_api import TornAPIClient, MemberSnapshot, SnapshotError, SnapshotStore, take_faction_snapshot
+
+np = snapshots.np
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestMemberSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.old = MemberSnapshot.from_records({
+            1: {"level": 10, "stats": {"attacks": 100, "xanax": 5}},
+            2: {"level": 20, "stats": {"attacks": 50, "xanax": 1}},
+            3: {"level": 30, "stats": {"attacks": 10}},
+        }, timestamp=0)
+        self.new = MemberSnapshot.from_records({
+            1: {"level": 11, "stats": {"attacks": 130, "xanax": 6}},
+            2: {"level": 20, "stats": {"attacks": 110, "xanax": 1}, "name": "bob"},
+            4: {"level": 1, "stats": {"attacks": 0}},
+        }, timestamp=7200)
+
+    def test_from_records(self):
+        self.assertEqual(self.old.ids.tolist(), [1, 2, 3])
+        self.assertEqual(self.old.columns, ["level", "stats.attacks", "stats.xanax"])
+        self.assertTrue(np.isnan(self.old.column("stats.xanax")[2]))
+
+    def test_diff(self):
+        diff = self.old.diff(self.new)
+        self.assertEqual(diff.ids.tolist(), [1, 2])
+        self.assertEqual(diff.joined.tolist(), [4])
+        self.assertEqual(diff.left.tolist(), [3])
+        self.assertEqual(diff.delta("stats.attacks").tolist(), [30, 60])
+        self.assertEqual(diff.rate("stats.attacks").tolist(), [15, 30])
+        self.assertEqual(diff.rates(per=7200)[:, 0].tolist(), [1, 0])
+
+    def test_leaderboard(self):
+        diff = self.old.diff(self.new)
+        self.assertEqual(diff.leaderboard("stats.attacks"), [(2, 60), (1, 30)])
+        self.assertEqual(diff.leaderboard("stats.attacks", top=1, ascending=True), [(1, 30)])
+
+    def test_store_round_trip(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = SnapshotStore(root)
+            store.save(99, self.old)
+            store.save(99, self.new)
+            self.assertEqual(store.timestamps(99), [0, 7200])
+            latest = store.latest(99)
+            self.assertIsInstance(latest.values, np.memmap)
+            self.assertEqual(latest.columns, self.new.columns)
+            np.testing.assert_array_equal(latest.values, self.new.values)
+            self.assertEqual(store.nearest(99, 1000).timestamp, 0)
+            self.assertEqual(store.timestamps(100), [])
+
+    def test_store_refuses_overwrite(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = SnapshotStore(root)
+            path = store.save(99, self.old)
+            with self.assertRaises(FileExistsError):
+                store.save(99, MemberSnapshot(self.new.ids, self.new.columns, self.new.values, 0.5))
+            self.assertEqual(store.load(99, 0).ids.tolist(), [1, 2, 3])
+            self.assertEqual(os.listdir(os.path.dirname(path)), ["0"])
+
+    def test_interrupted_save_leaves_no_snapshot(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = SnapshotStore(root)
+            with mock.patch.object(np, "save", side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    store.save(99, self.old)
+            self.assertEqual(store.timestamps(99), [])
+            self.assertEqual(os.listdir(os.path.join(root, "99")), [])
+
+    def test_take_faction_snapshot(self):
+        client = TornAPIClient(api_key="abc")
+        members = {"members": [{"id": 1, "name": "alice", "level": 10}, {"id": 2, "name": "bob", "level": 20}]}
+        stats = {"personalstats": {"attacking": {"attacks": {"won": 7}}}}
+        with mock.patch.object(client, "get_faction_members", return_value=members), \
+                mock.patch.object(client, "get_user_personalstats_by_id", return_value=stats) as get_stats:
+            snapshot = take_faction_snapshot(client, faction_id=5)
+        self.assertEqual(get_stats.call_count, 2)
+        self.assertEqual(snapshot.columns, ["member.id", "member.level", "personalstats.attacking.attacks.won"])
+        self.assertEqual(snapshot.column("member.level").tolist(), [10, 20])
+
+    def test_members_error_raises(self):
+        client = TornAPIClient(api_key="abc")
+        error = {"error": {"code": 5, "error": "Too many requests"}}
+        with mock.patch.object(client, "get_faction_members", return_value=error):
+            with self.assertRaisesRegex(SnapshotError, "Too many requests"):
+                take_faction_snapshot(client, faction_id=5)
+
+    def test_personalstats_error_raises(self):
+        client = TornAPIClient(api_key="abc")
+        members = {"members": [{"id": 1, "level": 10}, {"id": 2, "level": 20}]}
+        responses = [
+            {"personalstats": {"attacking": {"attacks": {"won": 7}}}},
+            {"error": {"code": 5, "error": "Too many requests"}},
+        ]
+        with mock.patch.object(client, "get_faction_members", return_value=members), \
+                mock.patch.object(client, "get_user_personalstats_by_id", side_effect=responses):
+            with self.assertRaisesRegex(SnapshotError, r"get_user_personalstats_by_id\(2\)"):
+                take_faction_snapshot(client, faction_id=5)
+
+
+if __name__ == '__main__':
+    unittest.main()